@@ -0,0 +1,76 @@
+# -------------------------------
+# SafeStreet Canada - Shared dashboard rendering
+# Used by final.py and polish.py; imports only the UI libraries so the
+# precomputed path never loads the model or the data
+# -------------------------------
+import os
+
+import altair as alt
+import pydeck as pdk
+import streamlit as st
+import streamlit.components.v1 as components
+
+# The standalone deck HTML only carries a Mapbox token when one is passed
+# explicitly (st.pydeck_chart used to inject Streamlit's); without one the
+# map falls back to Carto's token-free basemap
+MAPBOX_API_KEY = os.environ.get('MAPBOX_API_KEY')
+
+
+def render_table(top_areas):
+    st.subheader("Detailed Probabilities")
+    display_df = top_areas[['NEIGHBOURHOOD']].assign(
+        Severe_Accident_Probability=top_areas['Severe_Accident_Probability'].map('{:.2f}%'.format)
+    )
+    st.dataframe(display_df, hide_index=True)
+
+
+def render_chart(top_areas):
+    # top_areas is already sorted by probability, so pass the order explicitly
+    # and inline only the columns the chart uses
+    chart = alt.Chart(top_areas[['NEIGHBOURHOOD', 'Severe_Accident_Probability', 'color']]).mark_bar().encode(
+        x=alt.X('Severe_Accident_Probability:Q', title='Probability of Severe Accident (%)'),
+        y=alt.Y('NEIGHBOURHOOD:N', sort=top_areas['NEIGHBOURHOOD'].tolist(), title='Neighborhood'),
+        color=alt.Color('color:N', scale=None, legend=None),
+        tooltip=['NEIGHBOURHOOD', alt.Tooltip('Severe_Accident_Probability', format=".2f")]
+    ).properties(
+        width=700,
+        height=500,
+        title="Top 20 Accident-Prone Neighborhoods"
+    )
+    st.altair_chart(chart)
+
+
+def make_deck(layers):
+    return pdk.Deck(
+        map_provider='mapbox' if MAPBOX_API_KEY else 'carto',
+        map_style='mapbox://styles/mapbox/light-v10' if MAPBOX_API_KEY else pdk.map_styles.CARTO_LIGHT,
+        api_keys={'mapbox': MAPBOX_API_KEY} if MAPBOX_API_KEY else None,
+        initial_view_state=pdk.ViewState(
+            latitude=43.65107,
+            longitude=-79.347015,
+            zoom=10,
+            pitch=0,
+        ),
+        layers=layers,
+        tooltip={"text": "{NEIGHBOURHOOD}\n{Severe_Accident_Probability} %"}
+    )
+
+
+def render_map(layers):
+    # Render the deck's standalone HTML in an iframe; st.pydeck_chart
+    # re-serializes the spec on every rerun and pans/zooms far slower
+    deck = make_deck(layers)
+    components.html(deck.to_html(as_string=True, notebook_display=False), height=600, scrolling=False)
+
+
+def render_dashboard(top_areas, layers, title, intro):
+    # Color code: top 5 red, rest blue
+    top_areas = top_areas.assign(color=['red' if i < 5 else 'blue' for i in range(len(top_areas))])
+
+    st.title(title)
+    st.markdown(intro)
+    render_chart(top_areas)
+    render_table(top_areas)
+
+    st.subheader("Neighborhood Map")
+    render_map(layers)
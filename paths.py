@@ -0,0 +1,19 @@
+# -------------------------------
+# SafeStreet Canada - File paths
+# Kept free of heavy imports so the dashboards can use them without loading
+# joblib, pyarrow or the model
+# -------------------------------
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+MODEL_PATH = BASE_DIR / 'accident_model.pkl'
+FEATURES_PATH = BASE_DIR / 'features_columns.pkl'
+DATA_PATH = BASE_DIR / 'processed_data_numeric.csv'
+# Columnar copy of DATA_PATH written by precompute.py, preferred when present
+PARQUET_PATH = BASE_DIR / 'processed_data_numeric.parquet'
+
+# Written by `python precompute.py`
+TOP_AREAS_PATH = BASE_DIR / 'top_areas.json'
+META_PATH = BASE_DIR / 'meta.json'
+GEOJSON_PATH = BASE_DIR / 'neighbourhoods.geojson'
@@ -0,0 +1,211 @@
+# -------------------------------
+# SafeStreet Canada - Shared pipeline
+# load -> predict -> average per neighborhood -> top 20 -> coordinates,
+# shared by the dashboards (final.py, polish.py) and precompute.py
+# -------------------------------
+import re
+
+import joblib
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import streamlit as st
+
+from paths import DATA_PATH, FEATURES_PATH, MODEL_PATH, PARQUET_PATH
+
+# Rows per chunk when streaming the data through the model
+CHUNK_ROWS = 200_000
+
+# Cleanup for one-hot labels like 'NEIGHBOURHOOD_158_Alderwood (20)'
+NEIGH_PREFIX_RE = re.compile(r'NEIGHBOURHOOD_\d+_')
+NEIGH_SUFFIX_RE = re.compile(r'\s*\(\d+\)')
+
+# -------------------------------
+# Neighborhood Coordinates (replace with accurate lat/lon)
+# -------------------------------
+TORONTO_CENTER = (43.65107, -79.347015)
+
+neigh_coords = {
+    "Agincourt South-Malvern West": (43.801, -79.246),
+    "Alderwood": (43.634, -79.556),
+    # Add all neighborhoods you want
+}
+
+COORDS_DF = pd.DataFrame(
+    [(name, lat, lon) for name, (lat, lon) in neigh_coords.items()],
+    columns=['NEIGHBOURHOOD', 'lat', 'lon'],
+)
+
+
+def select_columns(header, feature_cols):
+    # Only the model features and neighborhood indicators are ever used
+    return [col for col in header if col in feature_cols or col.startswith('NEIGHBOURHOOD_')]
+
+
+def csv_dtypes(sample):
+    # Explicit dtypes spare the parser its type-inference passes. Numeric
+    # columns are all hinted float32, which also holds blanks/NaN that may
+    # only appear after the sample (argmax converts one-hots to int8 later);
+    # True/False columns are left to inference
+    return {
+        col: np.float32
+        for col in sample.columns
+        if pd.api.types.is_numeric_dtype(sample[col]) and not pd.api.types.is_bool_dtype(sample[col])
+    }
+
+
+# Stream the data in fixed-size chunks so peak memory does not grow with the file
+def iter_data(data_path, feature_cols):
+    if data_path.suffix == '.parquet':
+        parquet_file = pq.ParquetFile(data_path)
+        columns = select_columns(parquet_file.schema_arrow.names, feature_cols)
+        for batch in parquet_file.iter_batches(batch_size=CHUNK_ROWS, columns=columns):
+            yield batch.to_pandas()
+    else:
+        sample = pd.read_csv(data_path, nrows=1000)
+        columns = select_columns(sample.columns, feature_cols)
+        yield from pd.read_csv(
+            data_path, usecols=columns, dtype=csv_dtypes(sample[columns]), engine='c', chunksize=CHUNK_ROWS
+        )
+
+
+# Feature rows can repeat (most columns are one-hot), so predict each
+# distinct row once and broadcast back; skip when there is <2x repetition
+def predict_severe(model, X):
+    codes, uniques = pd.factorize(pd.util.hash_pandas_object(X, index=False))
+    if 2 * len(uniques) > len(X):
+        codes = None
+    else:
+        X = X.iloc[np.unique(codes, return_index=True)[1]]
+    # Tree models predict on float32, so cast up front to skip sklearn's own
+    # copy; staying a DataFrame keeps the feature names the model was fitted on
+    try:
+        probs = model.predict_proba(X.astype(np.float32, copy=False))[:, 1]
+    except (TypeError, ValueError):
+        probs = model.predict_proba(X)[:, 1]
+    return (probs if codes is None else probs[codes]) * 100
+
+
+def score_neighbourhoods(chunks, model, feature_cols, warn=print):
+    # Streaming mean: fold per-neighborhood sums and counts chunk by chunk
+    names = None
+    for df in chunks:
+        if names is None:
+            neigh_cols = [col for col in df.columns if col.startswith('NEIGHBOURHOOD_')]
+            if not neigh_cols:
+                warn("No neighborhood columns found in data.")
+                break
+            if not all(col in df.columns for col in feature_cols):
+                warn("Required feature columns not found. Predictions cannot be made.")
+                break
+
+            # Clean the ~160 column labels once instead of every row's label
+            names = np.array([NEIGH_SUFFIX_RE.sub('', NEIGH_PREFIX_RE.sub('', col)) for col in neigh_cols])
+            sums = np.zeros(len(neigh_cols))
+            counts = np.zeros(len(neigh_cols), dtype=np.int64)
+
+        # predict_proba still validates and allocates on an empty frame
+        if df.empty:
+            continue
+
+        idx = df[neigh_cols].to_numpy(dtype=np.int8, copy=False).argmax(axis=1)
+        probs = predict_severe(model, df[feature_cols])
+
+        # Mean probability per neighborhood index, without a per-row string column
+        sums += np.bincount(idx, weights=probs, minlength=len(neigh_cols))
+        counts += np.bincount(idx, minlength=len(neigh_cols))
+
+    if names is None:
+        return pd.DataFrame(columns=['NEIGHBOURHOOD', 'Severe_Accident_Probability'])
+    seen = counts > 0
+    return pd.DataFrame({
+        'NEIGHBOURHOOD': names[seen],
+        'Severe_Accident_Probability': sums[seen] / counts[seen],
+    })
+
+
+def top_neighbourhoods(neigh_scores, n=20):
+    # Select the top n in O(K), then sort only those n
+    means = neigh_scores['Severe_Accident_Probability'].to_numpy(dtype=float)
+    k = min(n, len(means))
+    top_idx = np.argpartition(-means, k - 1)[:k] if k else np.arange(0)
+    top_idx = top_idx[np.argsort(-means[top_idx])]
+    return neigh_scores.iloc[top_idx].reset_index(drop=True)
+
+
+def add_coords(top_areas):
+    top_areas = top_areas.merge(COORDS_DF, on='NEIGHBOURHOOD', how='left')
+    return top_areas.fillna({'lat': TORONTO_CENTER[0], 'lon': TORONTO_CENTER[1]})
+
+
+def build_neigh_scores(data_path, model, feature_cols, warn=print):
+    if not data_path.exists():
+        warn(f"{data_path} not found. Some app features may not work.")
+        return pd.DataFrame(columns=['NEIGHBOURHOOD', 'Severe_Accident_Probability'])
+    return score_neighbourhoods(iter_data(data_path, feature_cols), model, feature_cols, warn)
+
+
+def build_top_areas(data_path, model, feature_cols, warn=print):
+    return add_coords(top_neighbourhoods(build_neigh_scores(data_path, model, feature_cols, warn)))
+
+
+def build_meta(top_areas, neigh_scores=None):
+    probs = top_areas['Severe_Accident_Probability']
+    meta = {'prob_min': float(probs.min()), 'prob_max': float(probs.max())}
+    if neigh_scores is not None:
+        # Bounds over every scored neighborhood, for the all-neighborhoods tiles
+        all_probs = neigh_scores['Severe_Accident_Probability']
+        meta['tiles_prob_min'] = float(all_probs.min())
+        meta['tiles_prob_max'] = float(all_probs.max())
+    return meta
+
+
+# Point per neighborhood, used as tippecanoe input for the MVT tiles
+def build_geojson(areas):
+    return {
+        'type': 'FeatureCollection',
+        'features': [
+            {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [row.lon, row.lat]},
+                'properties': {
+                    'NEIGHBOURHOOD': row.NEIGHBOURHOOD,
+                    'Severe_Accident_Probability': float(row.Severe_Accident_Probability),
+                },
+            }
+            for row in areas.itertuples(index=False)
+        ],
+    }
+
+
+# -------------------------------
+# Cached accessors for the Streamlit apps
+# -------------------------------
+@st.cache_resource
+def get_model():
+    if not MODEL_PATH.exists():
+        raise FileNotFoundError(f"{MODEL_PATH} not found. Push the model file to GitHub.")
+    return joblib.load(MODEL_PATH)
+
+
+@st.cache_resource
+def get_features():
+    if not FEATURES_PATH.exists():
+        raise FileNotFoundError(f"{FEATURES_PATH} not found. Push the features file to GitHub.")
+    return joblib.load(FEATURES_PATH)
+
+
+def get_data_path():
+    return PARQUET_PATH if PARQUET_PATH.exists() else DATA_PATH
+
+
+@st.cache_data
+def load_top_areas(data_path, mtime, _model, feature_cols):
+    # mtime is only part of the cache key so edits to the data file invalidate it
+    return build_top_areas(data_path, _model, feature_cols, warn=st.warning)
+
+
+def get_top_areas():
+    data_path = get_data_path()
+    mtime = data_path.stat().st_mtime if data_path.exists() else None
+    return load_top_areas(data_path, mtime, get_model(), get_features())
@@ -0,0 +1,70 @@
+# -------------------------------
+# SafeStreet Canada - Offline precompute
+# Runs load -> predict -> average per neighborhood -> top 20 -> coordinates
+# and writes top_areas.json + meta.json for the dashboard to render directly.
+#
+# Usage: python precompute.py
+#
+# Converts processed_data_numeric.csv to Parquet first when the Parquet copy
+# is missing or older than the CSV.
+#
+# It also writes neighbourhoods.geojson for the all-neighborhoods map. Build
+# vector tiles from it and host them statically, e.g.
+#   tippecanoe -e tiles -l neighbourhoods -zg --no-tile-compression neighbourhoods.geojson
+# then point SAFESTREET_TILES_URL at https://<host>/tiles/{z}/{x}/{y}.pbf
+# -------------------------------
+import json
+import os
+
+import joblib
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from paths import DATA_PATH, FEATURES_PATH, GEOJSON_PATH, META_PATH, MODEL_PATH, PARQUET_PATH, TOP_AREAS_PATH
+from pipeline import (
+    add_coords, build_geojson, build_meta, build_neigh_scores, get_data_path, iter_data, top_neighbourhoods,
+)
+
+
+# Binary columnar copy of the CSV with only the used columns, so later loads
+# are field-level reads with no parsing. Streamed chunk by chunk; one row
+# group per chunk lines up with iter_data's batches. Written to a temporary
+# file and moved into place only on success, so a failed conversion never
+# leaves a truncated copy that get_data_path() would prefer over the CSV
+def write_parquet(feature_cols):
+    tmp_path = PARQUET_PATH.with_name(PARQUET_PATH.name + '.tmp')
+    writer = None
+    try:
+        for chunk in iter_data(DATA_PATH, feature_cols):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.replace(tmp_path, PARQUET_PATH)
+    finally:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+
+
+def main():
+    model = joblib.load(MODEL_PATH)
+    features_columns = joblib.load(FEATURES_PATH)
+
+    if DATA_PATH.exists() and (not PARQUET_PATH.exists() or PARQUET_PATH.stat().st_mtime < DATA_PATH.stat().st_mtime):
+        write_parquet(features_columns)
+        print(f"Wrote {PARQUET_PATH}")
+
+    neigh_scores = build_neigh_scores(get_data_path(), model, features_columns)
+    top_areas = add_coords(top_neighbourhoods(neigh_scores))
+    top_areas.to_json(TOP_AREAS_PATH, orient='records')
+    META_PATH.write_text(json.dumps(build_meta(top_areas, neigh_scores)))
+    GEOJSON_PATH.write_text(json.dumps(build_geojson(add_coords(neigh_scores))))
+    print(f"Wrote {len(top_areas)} neighborhoods to {TOP_AREAS_PATH}")
+
+
+if __name__ == '__main__':
+    main()